@@ -12,12 +12,122 @@ CircuitPython use.
 
 """
 
-import array
 import json
 
 __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_JSON_Stream.git"
 
+# Byte values of the structural characters, precomputed once so the hot loops
+# never call ord() per character.
+_QUOTE = ord('"')
+_OPEN_OBJECT = ord("{")
+_CLOSE_OBJECT = ord("}")
+_OPEN_LIST = ord("[")
+_CLOSE_LIST = ord("]")
+_COLON = ord(":")
+
+# Maps every structural JSON character to 0x01 and everything else to 0x00 so
+# that a single translate() pass per chunk marks the positions fast_forward
+# cares about. Not all ports provide bytes.translate(); fall back to scanning
+# byte by byte where it is missing.
+_HAS_TRANSLATE = hasattr(b"", "translate")
+if _HAS_TRANSLATE:
+    _STRUCTURAL_TABLE = bytes(0x01 if c in b'"[]{},' else 0x00 for c in range(256))
+
+# Action table for fast_forward's dispatch: 0 ignores the byte,
+# _MISMATCHED_CLOSER flags a closer that did not match the stack, and any
+# other value is the closing character to push for the opener just read
+# (a quote pushes itself).
+_MISMATCHED_CLOSER = 1
+_FF_ACTION = bytearray(256)
+_FF_ACTION[_QUOTE] = _QUOTE
+_FF_ACTION[_OPEN_OBJECT] = _CLOSE_OBJECT
+_FF_ACTION[_OPEN_LIST] = _CLOSE_LIST
+_FF_ACTION[_CLOSE_OBJECT] = _MISMATCHED_CLOSER
+_FF_ACTION[_CLOSE_LIST] = _MISMATCHED_CLOSER
+
+# Structured feeds repeat the same handful of object keys over and over, so
+# cache raw key bytes -> decoded str. The cache is cleared wholesale when it
+# fills; that keeps both the bookkeeping and the worst-case RAM use small.
+_KEY_CACHE_SIZE = 128
+_key_cache = {}
+
+# Scalar values skipped while scanning an object for a requested key would
+# otherwise be lost, because the stream cannot rewind. Each TransientObject
+# remembers a bounded number of them so a later lookup of an earlier key still
+# succeeds instead of raising KeyError. Containers are never remembered; that
+# would defeat the point of streaming.
+_SCANNED_CACHE_SIZE = 16
+
+
+def _decode_key(raw):
+    """Decode the raw (still quoted) bytes of an object key, reusing a cached
+    str when the same key has been seen before."""
+    key = _key_cache.get(raw)
+    if key is None:
+        if len(_key_cache) >= _KEY_CACHE_SIZE:
+            _key_cache.clear()
+        if (
+            len(raw) >= 2
+            and raw.startswith(b'"')
+            and raw.endswith(b'"')
+            and b"\\" not in raw
+        ):
+            # No escapes, so the key is just the bytes between the quotes.
+            key = raw[1:-1].decode("utf-8")
+        else:
+            key = json.loads(raw.decode("utf-8"))
+        _key_cache[raw] = key
+    return key
+
+
+def _encode_key(key):
+    """Return the quoted byte form of ``key`` for raw comparison, or None if
+    it has no canonical unescaped form."""
+    if isinstance(key, KnownKey):
+        return key.raw
+    if isinstance(key, str):
+        return f'"{key}"'.encode("utf-8")
+    return None
+
+
+def _parse_scalar(raw):  # pylint: disable=too-many-return-statements
+    """Parse the raw bytes of a JSON scalar, falling back to json.loads only
+    for the cases (escaped strings, exotic numbers) that need it."""
+    stripped = raw.strip()
+    if len(stripped) >= 2 and stripped.startswith(b'"') and stripped.endswith(b'"'):
+        if b"\\" not in stripped:
+            return stripped[1:-1].decode("utf-8")
+        return json.loads(stripped.decode("utf-8"))
+    if stripped == b"true":
+        return True
+    if stripped == b"false":
+        return False
+    if stripped == b"null":
+        return None
+    # int() and float() are laxer than JSON (leading "+" or zero padding,
+    # "_" separators, trailing "."), so only a token already shaped like a
+    # JSON number takes the fast path; everything else goes through
+    # json.loads so malformed documents keep raising JSONDecodeError.
+    body = stripped[1:] if stripped.startswith(b"-") else stripped
+    if (
+        body
+        and body[0] in b"0123456789"
+        and stripped[-1] in b"0123456789"
+        and b"_" not in stripped
+        and not (len(body) > 1 and body.startswith(b"0") and body[1] in b"0123456789")
+    ):
+        text = stripped.decode("utf-8")
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            return float(text)
+        except ValueError:
+            pass
+    return json.loads(stripped.decode("utf-8"))
+
 
 class _IterToStream:
     """Converts an iterator to a JSON data stream."""
@@ -26,72 +136,280 @@ class _IterToStream:
         self.data_iter = data_iter
         self.i = 0
         self.chunk = b""
+        self._struct_map = None
+        self.terminator = None
 
     def read(self):
         """Read the next character from the stream."""
         if self.i >= len(self.chunk):
             try:
-                self.chunk = next(self.data_iter)
+                chunk = next(self.data_iter)
             except StopIteration as exc:
                 raise EOFError from exc
+            if not isinstance(chunk, (bytes, bytearray)):
+                chunk = bytes(chunk)
+            self.chunk = chunk
+            self._struct_map = None
             self.i = 0
         char = self.chunk[self.i]
         self.i += 1
         return char
 
-    def fast_forward(self, closer):
+    def peek_value_is_container(self):
+        """Skip leading whitespace and report whether the next value starts an
+        object or a list, without consuming its first character."""
+        while True:
+            chunk = self.chunk
+            i = self.i
+            end = len(chunk)
+            while i < end and chunk[i] in b" \t\r\n":
+                i += 1
+            self.i = i
+            if i < end:
+                char = chunk[i]
+                # pylint: disable-next=consider-using-in
+                return char == _OPEN_OBJECT or char == _OPEN_LIST
+            try:
+                chunk = next(self.data_iter)
+            except StopIteration:
+                return False
+            if not chunk:
+                return False
+            if not isinstance(chunk, (bytes, bytearray)):
+                chunk = bytes(chunk)
+            self.chunk = chunk
+            self._struct_map = None
+            self.i = 0
+
+    def _structural_map(self):
+        """Return a byte map of the current chunk with 0x01 at every
+        structural character, computing it once per chunk refill."""
+        if self._struct_map is None:
+            self._struct_map = self.chunk.translate(_STRUCTURAL_TABLE)
+        return self._struct_map
+
+    def fast_forward(self, closer, buffer=None):
         """Read through the stream until the character is ``closer``, ``]``
         (ending a list) or ``}`` (ending an object.) Intermediate lists and
-        objects are skipped."""
-        closer = ord(closer)
-        close_stack = [closer]
-        count = 0
-        while close_stack:
+        objects are skipped.
+
+        Scans the current chunk in place instead of reading one character at
+        a time so skipped spans cost a tight loop over the buffer rather than
+        a method call per byte.
+
+        If ``buffer`` is given, every consumed byte is appended to it, one
+        memoryview span per chunk, so nothing is copied byte by byte."""
+        # pylint: disable=too-many-branches,too-many-locals
+        # pylint: disable=too-many-statements,too-many-nested-blocks
+        # The top two expected closers live in plain locals and strings are
+        # tracked with a flag instead of a stack entry, so skipping scalars
+        # and flat containers allocates nothing. Deeper nesting spills into a
+        # lazily created bytearray, indexed so pushes and pops stay plain
+        # stores.
+        top = ord(closer)
+        under = -1
+        close_stack = None
+        stack_size = 0
+        depth = 0
+        in_string = False
+        while True:
+            chunk = self.chunk
+            i = self.i
+            end = len(chunk)
+            if i >= end:
+                try:
+                    chunk = next(self.data_iter)
+                except StopIteration as exc:
+                    raise EOFError from exc
+                if not chunk:
+                    raise EOFError
+                if not isinstance(chunk, (bytes, bytearray)):
+                    # Sources may yield memoryview (or other buffer) slices;
+                    # the scanners need bytes methods like find().
+                    chunk = bytes(chunk)
+                self.chunk = chunk
+                self._struct_map = None
+                i = 0
+                end = len(chunk)
+            start = i
+            struct_map = self._structural_map() if _HAS_TRANSLATE else None
+            while i < end:
+                if in_string:
+                    # In a string, so ignore [] and {}. Everything up to the
+                    # closing quote is skippable; find() scans it at C speed.
+                    quote_pos = chunk.find(b'"', i)
+                    if quote_pos < 0:
+                        i = end
+                        break
+                    i = quote_pos + 1
+                    in_string = False
+                    continue
+                if struct_map is not None:
+                    # Jump straight to the next structural character; the
+                    # bytes in between cannot change the close stack.
+                    pos = struct_map.find(b"\x01", i)
+                    if pos < 0:
+                        i = end
+                        break
+                    char = chunk[pos]
+                    i = pos + 1
+                else:
+                    char = chunk[i]
+                    i += 1
+                if char == top:
+                    if under < 0:
+                        if buffer is not None:
+                            buffer.extend(memoryview(chunk)[start:i])
+                        self.i = i
+                        return False
+                    top = under
+                    if depth:
+                        depth -= 1
+                        # pylint: disable-next=unsubscriptable-object
+                        under = close_stack[depth]
+                    else:
+                        under = -1
+                else:
+                    action = _FF_ACTION[char]
+                    if action == _QUOTE:
+                        in_string = True
+                    elif action > _MISMATCHED_CLOSER:
+                        if under >= 0:
+                            if close_stack is None:
+                                close_stack = bytearray(16)
+                                stack_size = 16
+                            elif depth == stack_size:
+                                close_stack.extend(b"\x00" * stack_size)
+                                stack_size *= 2
+                            close_stack[depth] = under
+                            depth += 1
+                        under = top
+                        top = action
+                    elif action == _MISMATCHED_CLOSER:
+                        # Mismatched list or object means we're done and past
+                        # the last comma.
+                        if buffer is not None:
+                            buffer.extend(memoryview(chunk)[start:i])
+                        self.i = i
+                        return True
+            if buffer is not None:
+                buffer.extend(memoryview(chunk)[start:i])
+            self.i = i
+
+    def enter_object(self):
+        """Consume whitespace up to the next value, which must start an
+        object."""
+        while True:
             char = self.read()
-            count += 1
-            if char == close_stack[-1]:
-                close_stack.pop()
-            elif char == ord('"'):
-                close_stack.append(ord('"'))
-            elif close_stack[-1] == ord('"'):
-                # in a string so ignore [] and {}
-                pass
-            elif char in (ord("}"), ord("]")):
-                # Mismatched list or object means we're done and already past the last comma.
-                return True
-            elif char == ord("{"):
-                close_stack.append(ord("}"))
-            elif char == ord("["):
-                close_stack.append(ord("]"))
-        return False
+            if char == _OPEN_OBJECT:
+                return
+            if char not in b" \t\r\n":
+                raise ValueError("expected an object")
 
     def next_value(self, endswith=None):
-        """Read and parse the next JSON data."""
-        buf = array.array("B")
+        """Read and parse the next JSON data.
+
+        Like fast_forward, works on the current chunk through local variables
+        so the per-character loop does no method calls or attribute loads.
+
+        The byte that ended the value is left in ``self.terminator`` (None
+        when the value is a container or the stream ran out) so callers can
+        tell whether the value also closed its enclosing object or list."""
+        # pylint: disable=too-many-return-statements,too-many-branches
+        # The chained == comparisons are deliberate; they avoid building a
+        # tuple per character for an ``in`` test.
+        # pylint: disable=consider-using-in
+        # Preallocated and indexed instead of appended to; scalars are almost
+        # always short so the initial allocation is rarely grown.
+        buf = bytearray(64)
+        buf_size = 64
+        n = 0
+        self.terminator = None
         if isinstance(endswith, str):
             endswith = ord(endswith)
         in_string = False
         while True:
-            try:
-                char = self.read()
-            except EOFError:
-                char = endswith
-            if not in_string and (char == endswith or char in (ord("]"), ord("}"))):
-                if len(buf) == 0:
-                    return None
-                value_string = bytes(buf).decode("utf-8")
-                # print(f"{repr(value_string)}, {endswith=}")
-                return json.loads(value_string)
-            if char == ord("{"):
-                return TransientObject(self)
-            if char == ord("["):
-                return TransientList(self)
-
-            if not in_string:
-                in_string = char == ord('"')
-            else:
-                in_string = char != ord('"')
-            buf.append(char)
+            chunk = self.chunk
+            i = self.i
+            end = len(chunk)
+            if i >= end:
+                chunk = None
+                try:
+                    chunk = next(self.data_iter)
+                except StopIteration:
+                    pass
+                if not chunk:
+                    # Stream exhausted; ends the value like the terminator
+                    # would.
+                    break
+                if not isinstance(chunk, (bytes, bytearray)):
+                    # Sources may yield memoryview (or other buffer) slices;
+                    # the scanners need bytes methods like find().
+                    chunk = bytes(chunk)
+                self.chunk = chunk
+                self._struct_map = None
+                i = 0
+                end = len(chunk)
+            while i < end:
+                char = chunk[i]
+                i += 1
+                if not in_string and (
+                    char == endswith or char == _CLOSE_LIST or char == _CLOSE_OBJECT
+                ):
+                    self.i = i
+                    self.terminator = char
+                    if n == 0:
+                        return None
+                    if endswith == _COLON:
+                        # Object key; returned raw so the caller can choose
+                        # how (or whether) to decode it.
+                        return bytes(memoryview(buf)[:n]).strip()
+                    return _parse_scalar(bytes(memoryview(buf)[:n]))
+                if char == _OPEN_OBJECT:
+                    self.i = i
+                    return TransientObject(self)
+                if char == _OPEN_LIST:
+                    self.i = i
+                    return TransientList(self)
+
+                # A quote toggles the in-string state; nothing else changes it.
+                in_string ^= char == _QUOTE
+                if n == buf_size:
+                    buf.extend(b"\x00" * buf_size)
+                    buf_size *= 2
+                buf[n] = char
+                n += 1
+            self.i = i
+        if n == 0:
+            return None
+        if endswith == _COLON:
+            return bytes(memoryview(buf)[:n]).strip()
+        return _parse_scalar(bytes(memoryview(buf)[:n]))
+
+
+class KnownKey:  # pylint: disable=too-few-public-methods
+    """An object key encoded once up front so that repeated lookups compare
+    raw bytes from the stream instead of decoding every candidate key.
+
+    Keys the document spells without escape sequences (virtually all
+    real-world feeds) match on the raw bytes; escaped spellings fall back to
+    decoding the candidate.
+
+    .. code-block:: python
+
+        name = json_stream.KnownKey("name")
+        for event in json_data["events"]:
+            print(event[name])
+    """
+
+    def __init__(self, key):
+        self.key = key
+        # Raw UTF-8, not json.dumps(), which would \u-escape non-ASCII keys
+        # and never match a document that spells them directly.
+        self.raw = f'"{key}"'.encode("utf-8")
+
+    def __str__(self):
+        return self.key
 
 
 class Transient:  # pylint: disable=too-few-public-methods
@@ -99,6 +417,11 @@ class Transient:  # pylint: disable=too-few-public-methods
 
     # This is helpful for checking that something is a TransientList or TransientObject.
 
+    # The hot paths check this flag with getattr() instead of isinstance();
+    # scalars fall through on the attribute miss without walking the class
+    # hierarchy per value.
+    is_transient = True
+
 
 class TransientList(Transient):
     """Transient object that acts like a list through the stream."""
@@ -117,6 +440,14 @@ class TransientList(Transient):
             self.data.fast_forward("]")
         self.done = True
 
+    def as_object(self):
+        """Consume the rest of this list from the stream and return it as one
+        fully parsed list. Must be called before any items have been read."""
+        buffer = bytearray(b"[")
+        self.data.fast_forward("]", buffer=buffer)
+        self.done = True
+        return json.loads(bytes(buffer).decode("utf-8"))
+
     def __iter__(self):
         return self
 
@@ -131,7 +462,7 @@ class TransientList(Transient):
         if next_value is None:
             self.done = True
             raise StopIteration()
-        if isinstance(next_value, Transient):
+        if getattr(next_value, "is_transient", False):
             self.active_child = next_value
         return next_value
 
@@ -142,9 +473,11 @@ class TransientObject(Transient):
     def __init__(self, stream):
         self.data = stream
         self.done = False
-        self.buf = array.array("B")
 
         self.active_child = None
+        self.active_child_key = None
+        self._open_levels = 0
+        self._scanned = {}
 
     def finish(self):
         """Consume all of the characters for this object from the stream."""
@@ -152,33 +485,169 @@ class TransientObject(Transient):
             if self.active_child:
                 self.active_child.finish()
                 self.active_child = None
+                self.active_child_key = None
             self.data.fast_forward("}")
+            # Unwind any levels that skip_to_key() descended into.
+            while self._open_levels:
+                self._open_levels -= 1
+                self.data.fast_forward("}")
+        self.done = True
+
+    def as_object(self):
+        """Consume the rest of this object from the stream and return it as
+        one fully parsed dict. Must be called before any items have been
+        read."""
+        buffer = bytearray(b"{")
+        self.data.fast_forward("}", buffer=buffer)
         self.done = True
+        return json.loads(bytes(buffer).decode("utf-8"))
 
-    def __getitem__(self, key):
+    def __getitem__(self, key):  # pylint: disable=too-many-branches
+        # Decoded candidate keys are str, so compare (and cache) against the
+        # str form of a KnownKey rather than the KnownKey itself.
+        key_str = key.key if isinstance(key, KnownKey) else key
+        if self._scanned and key_str in self._scanned:
+            return self._scanned[key_str]
         if self.active_child:
+            # Asking for the same key again hands back the same child instead
+            # of consuming it; the stream cannot rewind.
+            if key == self.active_child_key:
+                return self.active_child
             self.active_child.finish()
             self.done = self.data.fast_forward(",")
             self.active_child = None
+            self.active_child_key = None
         if self.done:
             raise KeyError()
 
+        raw_key = _encode_key(key)
+        data = self.data
         while True:
-            current_key = self.data.next_value(":")
+            current_key = data.next_value(":")
             if current_key is None:
                 # print("object done", self)
                 self.done = True
                 break
-            if current_key == key:
-                next_value = self.data.next_value(",")
-                if isinstance(next_value, Transient):
+            if raw_key is None:
+                matched = _decode_key(current_key) == key_str
+            elif current_key == raw_key:
+                matched = True
+            else:
+                # Without escapes no other spelling can decode to key, so the
+                # candidate never needs decoding at all.
+                matched = b"\\" in current_key and _decode_key(current_key) == key_str
+            if matched:
+                next_value = data.next_value(",")
+                if getattr(next_value, "is_transient", False):
                     self.active_child = next_value
+                    self.active_child_key = key
                 return next_value
-            self.data.fast_forward(",")
+            if (
+                len(self._scanned) < _SCANNED_CACHE_SIZE
+                and not data.peek_value_is_container()
+            ):
+                # Remember the scalar being skipped so a later lookup of this
+                # key does not have to fail.
+                buffer = bytearray()
+                data.fast_forward(",", buffer=buffer)
+                value = _parse_scalar(bytes(buffer[:-1]))
+                self._scanned[_decode_key(current_key)] = value
+            else:
+                data.fast_forward(",")
         raise KeyError()
 
+    def skip_to_key(self, *path):  # pylint: disable=too-many-branches
+        """Descend through nested objects along ``path`` and return the value
+        at the end, like chained lookups but without building a
+        TransientObject per intermediate level. The levels descended into are
+        unwound when this object is finished, so after reading the value the
+        natural next step is to move on (iterate the parent or finish)."""
+        if not path:
+            raise KeyError()
+        if self.active_child:
+            self.active_child.finish()
+            self.done = self.data.fast_forward(",")
+            self.active_child = None
+            self.active_child_key = None
+        if self.done:
+            raise KeyError()
+
+        last = len(path) - 1
+        data = self.data
+        for index, key in enumerate(path):
+            raw_key = _encode_key(key)
+            key_str = key.key if isinstance(key, KnownKey) else key
+            while True:
+                current_key = data.next_value(":")
+                if current_key is None:
+                    # The level that ran out of keys consumed its own closer.
+                    if self._open_levels:
+                        self._open_levels -= 1
+                    else:
+                        self.done = True
+                    raise KeyError()
+                if raw_key is None:
+                    matched = _decode_key(current_key) == key_str
+                elif current_key == raw_key:
+                    matched = True
+                else:
+                    # Without escapes no other spelling can decode to key, so
+                    # the candidate never needs decoding at all.
+                    matched = (
+                        b"\\" in current_key and _decode_key(current_key) == key_str
+                    )
+                if matched:
+                    break
+                if data.fast_forward(","):
+                    # Mismatched closer: this level is exhausted.
+                    if self._open_levels:
+                        self._open_levels -= 1
+                    else:
+                        self.done = True
+                    raise KeyError()
+            if index == last:
+                break
+            data.enter_object()
+            self._open_levels += 1
+        next_value = data.next_value(",")
+        if data.terminator == _CLOSE_OBJECT:
+            # The leaf was the last key of its object, so reading it already
+            # closed that level.
+            if self._open_levels:
+                self._open_levels -= 1
+            else:
+                self.done = True
+        if getattr(next_value, "is_transient", False):
+            self.active_child = next_value
+        return next_value
+
+
+def _coalesce(data_iter, buffer_size):
+    """Joins the chunks of ``data_iter`` into blocks of at least
+    ``buffer_size`` bytes. An empty chunk ends the stream."""
+    buffer = bytearray()
+    for chunk in data_iter:
+        if not chunk:
+            break
+        if not buffer and len(chunk) >= buffer_size:
+            yield chunk
+            continue
+        buffer.extend(chunk)
+        if len(buffer) >= buffer_size:
+            yield bytes(buffer)
+            buffer = bytearray()
+    if buffer:
+        yield bytes(buffer)
+
+
+def load(data_iter, buffer_size=0):
+    """Returns an object to represent the top level of the given JSON stream.
 
-def load(data_iter):
-    """Returns an object to represent the top level of the given JSON stream."""
+    When ``buffer_size`` is set, incoming chunks are joined into blocks of at
+    least that many bytes before parsing. Sources that hand out tiny chunks
+    (e.g. ``iter_content(32)``) make the parser cross a chunk boundary every
+    few characters; coalescing trades a little RAM for far fewer crossings."""
+    if buffer_size:
+        data_iter = _coalesce(data_iter, buffer_size)
     stream = _IterToStream(data_iter)
     return stream.next_value(None)